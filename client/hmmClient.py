@@ -8,6 +8,8 @@ Examples:
   python3 hmmClient.py --addr http://localhost:1337 tasks add post --name up --type uploadlink --data https://example.com/a.jpg --post-type application/x-www-form-urlencoded --post-data "link=https://example.com/a.jpg"
   python3 hmmClient.py --addr http://localhost:1337 tasks run --name ping
   python3 hmmClient.py --addr http://localhost:1337 routine add --name ping --minutes 5
+  printf 'ping 5\nup 60\n' | python3 hmmClient.py --addr http://localhost:1337 routine add-many
+  python3 hmmClient.py --addr http://localhost:1337 routine add-many --file routines.json
   python3 hmmClient.py --addr http://localhost:1337 clip get
   python3 hmmClient.py --addr http://localhost:1337 clip save --text "hello world"
   python3 hmmClient.py --addr http://localhost:1337 upload file --path ./notes.txt
@@ -22,79 +24,234 @@ Examples:
   python3 hmmClient.py --addr http://localhost:1337 health
 """
 
+from __future__ import annotations
+
 import argparse
+import atexit
+import functools
 import os
 import sys
+import time
 import typing as t
+from urllib.parse import quote
+
+try:
+    import orjson as _json  # optional, several times faster than the stdlib parser
+except ImportError:
+    import json as _json
 
-import requests
-import pyperclip
+if t.TYPE_CHECKING:
+    import requests
 
 DEFAULT_ADDR = os.getenv("HMM_ADDR", "http://localhost:1337")
 TIMEOUT = 10  # seconds
+CHUNK_SIZE = 64 * 1024  # bytes per read when streaming downloads
+ROUTINE_WORKERS = 8  # concurrent POSTs for routine add-many
+TASK_NAMES_TTL = 5.0  # seconds a fetched task list is reused for validation
+
+
+# requests and pyperclip are imported where they are used: they cost more
+# than the rest of startup combined, and --help or a usage error needs neither.
+@functools.lru_cache(maxsize=1)
+def _session() -> requests.Session:
+    # One pooled session per process so consecutive calls to the same server
+    # reuse the TCP (and TLS) connection instead of reconnecting every time.
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    atexit.register(session.close)
+    return session
+
+
+# ----- endpoints -----
+
+EP_HEALTH = "/health"
+EP_TASK_LIST = "/api/task"
+EP_TASK_ADD = "/api/task/add"
+EP_TASK_RUN = "/api/task/run"
+EP_TASK_LOG = "/api/task/log"
+EP_ROUTINE_LIST = "/api/task/interval"
+EP_ROUTINE_ADD = "/api/task/interval/add"
+EP_CLIP = "/api/clip"
+EP_CLIP_SAVE = "/api/clip/save"
+EP_CLIP_HISTORY = "/api/clip/history"
+EP_CLIP_ERASE = "/api/clip/erase"
+EP_NOTES_LIST = "/api/notes"
+EP_NOTES_ADD = "/api/notes/add"
+EP_UPLOAD = "/api/upload"
+EP_UPLOAD_LINK = "/api/uploadLink"
+EP_FILES_LIST = "/api/files/list"
+EP_FILES_DEL = "/api/files/del"
+EP_FILES_MV = "/api/files/mv"
+EP_FILES_WRITE = "/api/write/"
+EP_SCRAPER_LINKS = "/api/scraper/links/"
+EP_SCRAPER_IMGS = "/api/scraper/imgs/"
+EP_SCRAPER_CHEERIO = "/api/scraper/cheeriohtml"
+EP_CFG_IMPORT = "/api/cfg/import"
+EP_CFG_EXPORT = "/api/cfg/export"
+EP_RESTART = "/api/restart"
+EP_CONSOLE = "/api/console"
 
 
 def _url(addr: str, path: str) -> str:
-    return addr.rstrip("/") + path
+    # addr is normalized (no trailing slash) once in main()
+    return addr + path
 
 
 def _print(text: t.Union[str, bytes]) -> None:
     if isinstance(text, bytes):
-        try:
+        out = getattr(sys.stdout, "buffer", None)
+        if out is None:
+            # stdout swapped for a text-only stream (e.g. io.StringIO)
             sys.stdout.write(text.decode("utf-8", errors="replace"))
-        except Exception:
-            sys.stdout.buffer.write(text)
+            if not text.endswith(b"\n"):
+                sys.stdout.write("\n")
+            return
+        # server bodies are UTF-8 already, skip the decode/re-encode round trip;
+        # flush pending text first so output stays in order
+        sys.stdout.flush()
+        out.write(text)
+        if not text.endswith(b"\n"):
+            out.write(b"\n")
     else:
-        sys.stdout.write(str(text))
-    if not str(text).endswith("\n"):
-        sys.stdout.write("\n")
+        sys.stdout.write(text)
+        if not text.endswith("\n"):
+            sys.stdout.write("\n")
 
 
-def _handle_req(fn: t.Callable[[], requests.Response]) -> int:
+def _save_stream(resp: requests.Response, out_path: str) -> None:
+    # write the body as it arrives so memory stays flat for large files; it
+    # goes to a sibling .part file that only replaces out_path once complete,
+    # so a dropped connection leaves any existing file untouched
+    part_path = out_path + ".part"
     try:
-        resp = fn()
-        _print(resp.text)
-        return 0 if resp.ok else (resp.status_code if resp.status_code else 1)
-    except requests.RequestException as e:
-        _print(f"[error] {e}")
-        return 2
+        with open(part_path, "wb") as f:
+            for chunk in resp.iter_content(chunk_size=CHUNK_SIZE):
+                f.write(chunk)
+        os.replace(part_path, out_path)
+    except BaseException:
+        try:
+            os.unlink(part_path)
+        except OSError:
+            pass
+        raise
+
+
+def _task_names(tasks: t.Any) -> t.Set[str]:
+    # /api/task returns a list of task objects; index their names once
+    return {task["name"] for task in tasks if isinstance(task, dict) and "name" in task}
+
+
+# addr -> (fetched at, task names); the task list rarely changes, so repeated
+# validations within TASK_NAMES_TTL share one /api/task round trip
+_task_names_cache: t.Dict[str, t.Tuple[float, t.Set[str]]] = {}
+
+
+def _fetch_task_names(addr: str) -> t.Set[str]:
+    now = time.monotonic()
+    cached = _task_names_cache.get(addr)
+    if cached is not None and now - cached[0] < TASK_NAMES_TTL:
+        return cached[1]
+    resp = _session().get(_url(addr, EP_TASK_LIST), timeout=TIMEOUT)
+    resp.raise_for_status()
+    # the body is UTF-8 JSON; both parsers take bytes directly, skipping the
+    # charset detection that resp.json()/resp.text would run first
+    names = _task_names(_json.loads(resp.content))
+    _task_names_cache[addr] = (now, names)
+    return names
+
+
+def _forget_task_names(addr: str) -> None:
+    # called by commands that change the server's task list
+    _task_names_cache.pop(addr, None)
+
+
+def _check_tasks_exist(addr: str, names: t.Iterable[str],
+                       task_names: t.Optional[t.Set[str]] = None) -> int:
+    import requests
+
+    if task_names is None:
+        try:
+            task_names = _fetch_task_names(addr)
+        except requests.RequestException as e:
+            _print(f"[error] cannot validate task existence: {e}")
+            return 2
+        except ValueError as e:
+            _print(f"[error] server returned invalid tasks payload: {e}")
+            return 2
+    missing = [name for name in names if name not in task_names]
+    for name in missing:
+        _print(f"[error] task '{name}' does not exist on server")
+    return 1 if missing else 0
+
+
+def _emit(resp: requests.Response) -> int:
+    _print(resp.content)
+    return 0 if resp.ok else (resp.status_code if resp.status_code else 1)
+
+
+def _request_errors(fn: t.Callable[..., int]) -> t.Callable[..., int]:
+    # wraps a cmd_* function so network failures print "[error] ..." and exit 2
+    @functools.wraps(fn)
+    def wrapper(*args: t.Any, **kwargs: t.Any) -> int:
+        import requests
+
+        try:
+            return fn(*args, **kwargs)
+        except requests.RequestException as e:
+            _print(f"[error] {e}")
+            return 2
+    return wrapper
 
 
 # ----- tasks -----
 
+@_request_errors
 def cmd_tasks_list(addr: str) -> int:
-    return _handle_req(lambda: requests.get(_url(addr, "/api/task"), timeout=TIMEOUT))
+    return _emit(_session().get(_url(addr, EP_TASK_LIST), timeout=TIMEOUT))
 
 
+@_request_errors
 def cmd_tasks_add_get(addr: str, name: str, ttype: str, data: str) -> int:
-    return _handle_req(lambda: requests.post(_url(addr, "/api/task/add"),
-                                             data={"name": name, "type": ttype, "data": data},
-                                             timeout=TIMEOUT))
+    _forget_task_names(addr)
+    return _emit(_session().post(_url(addr, EP_TASK_ADD),
+                                 data={"name": name, "type": ttype, "data": data},
+                                 timeout=TIMEOUT))
 
 
+@_request_errors
 def cmd_tasks_add_post(addr: str, name: str, ttype: str, data: str, post_type: str, post_data: str) -> int:
-    return _handle_req(lambda: requests.post(_url(addr, "/api/task/add"),
-                                             data={"name": name, "type": ttype, "data": data,
-                                                   "pType": post_type, "pData": post_data},
-                                             timeout=TIMEOUT))
+    _forget_task_names(addr)
+    return _emit(_session().post(_url(addr, EP_TASK_ADD),
+                                 data={"name": name, "type": ttype, "data": data,
+                                       "pType": post_type, "pData": post_data},
+                                 timeout=TIMEOUT))
 
 
+@_request_errors
 def cmd_tasks_run(addr: str, name: str) -> int:
-    return _handle_req(lambda: requests.post(_url(addr, "/api/task/run"),
-                                             data={"name": name},
-                                             timeout=TIMEOUT))
+    return _emit(_session().post(_url(addr, EP_TASK_RUN),
+                                 data={"name": name},
+                                 timeout=TIMEOUT))
 
 
+@_request_errors
 def cmd_tasks_del(addr: str, name: str) -> int:
-    return _handle_req(lambda: requests.get(_url(addr, f"/api/task/del/{name}"), timeout=TIMEOUT))
+    _forget_task_names(addr)
+    return _emit(_session().get(_url(addr, f"/api/task/del/{quote(name, safe='')}"), timeout=TIMEOUT))
 
 
 def cmd_tasks_log(addr: str, out_path: str) -> int:
+    import requests
+
     try:
-        resp = requests.get(_url(addr, "/api/task/log"), timeout=TIMEOUT)
-        resp.raise_for_status()
-        with open(out_path, "wb") as f:
-            f.write(resp.content)
+        with _session().get(_url(addr, EP_TASK_LOG), stream=True, timeout=TIMEOUT) as resp:
+            resp.raise_for_status()
+            _save_stream(resp, out_path)
         _print(f"saved logs to {out_path}")
         return 0
     except requests.RequestException as e:
@@ -107,11 +264,15 @@ def cmd_tasks_log(addr: str, out_path: str) -> int:
 
 # ----- routine -----
 
+@_request_errors
 def cmd_routine_list(addr: str) -> int:
-    return _handle_req(lambda: requests.get(_url(addr, "/api/task/interval"), timeout=TIMEOUT))
+    return _emit(_session().get(_url(addr, EP_ROUTINE_LIST), timeout=TIMEOUT))
 
 
-def cmd_routine_add(addr: str, name: str, minutes: t.Optional[int], ms: t.Optional[int]) -> int:
+@_request_errors
+def cmd_routine_add(addr: str, name: str, minutes: t.Optional[int], ms: t.Optional[int],
+                    task_names: t.Optional[t.Set[str]] = None) -> int:
+    # task_names lets callers that already fetched /api/task skip the round trip
     if minutes is not None:
         time_ms = minutes * 60000
     elif ms is not None:
@@ -121,35 +282,101 @@ def cmd_routine_add(addr: str, name: str, minutes: t.Optional[int], ms: t.Option
         return 1
 
     # Pre-validate that the task exists on the server
-    try:
-        resp = requests.get(_url(addr, "/api/task"), timeout=TIMEOUT)
-        resp.raise_for_status()
-        tasks = resp.json()
-        exists = any(isinstance(t, dict) and t.get("name") == name for t in tasks)
-        if not exists:
-            _print(f"[error] task '{name}' does not exist on server")
+    rc = _check_tasks_exist(addr, [name], task_names)
+    if rc:
+        return rc
+
+    return _emit(_session().post(_url(addr, EP_ROUTINE_ADD),
+                                 data={"name": name, "time": str(time_ms)},
+                                 timeout=TIMEOUT))
+
+
+def cmd_routine_add_batch(addr: str, specs: t.Sequence[t.Tuple[str, int]]) -> int:
+    # specs are (task name, interval in ms); tasks are validated with a single
+    # GET and the independent POSTs are overlapped on the shared session
+    from concurrent.futures import ThreadPoolExecutor
+
+    import requests
+
+    if not specs:
+        _print("[error] no routines given")
+        return 1
+    rc = _check_tasks_exist(addr, [name for name, _ in specs])
+    if rc:
+        return rc
+
+    session = _session()
+    with ThreadPoolExecutor(max_workers=ROUTINE_WORKERS) as pool:
+        futures = [pool.submit(session.post, _url(addr, EP_ROUTINE_ADD),
+                               data={"name": name, "time": str(time_ms)},
+                               timeout=TIMEOUT)
+                   for name, time_ms in specs]
+        # report in input order from this thread so output never interleaves
+        rcs = []
+        for fut in futures:
+            try:
+                rcs.append(_emit(fut.result()))
+            except requests.RequestException as e:
+                _print(f"[error] {e}")
+                rcs.append(2)
+    return next((rc for rc in rcs if rc), 0)
+
+
+def cmd_routine_add_many(addr: str, stream: t.TextIO) -> int:
+    # one "NAME MINUTES" pair per line; blank lines and # comments are skipped
+    specs = []
+    for lineno, line in enumerate(stream, 1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        try:
+            name, minutes = line.rsplit(None, 1)
+            specs.append((name, int(minutes) * 60000))
+        except ValueError:
+            _print(f"[error] line {lineno}: expected 'NAME MINUTES', got '{line}'")
             return 1
-    except requests.RequestException as e:
-        _print(f"[error] cannot validate task existence: {e}")
-        return 2
+    return cmd_routine_add_batch(addr, specs)
+
+
+def cmd_routine_add_file(addr: str, path: str) -> int:
+    # JSON list of {"name": ..., "minutes": ...} or {"name": ..., "ms": ...}
+    try:
+        with open(path, "rb") as f:
+            entries = _json.loads(f.read())
+    except OSError as e:
+        _print(f"[error] cannot read {path}: {e}")
+        return 3
     except ValueError as e:
-        _print(f"[error] server returned invalid tasks payload: {e}")
-        return 2
+        _print(f"[error] {path} is not valid JSON: {e}")
+        return 1
+    if not isinstance(entries, list):
+        _print(f"[error] {path}: expected a JSON list of routines")
+        return 1
 
-    return _handle_req(lambda: requests.post(_url(addr, "/api/task/interval/add"),
-                                             data={"name": name, "time": str(time_ms)},
-                                             timeout=TIMEOUT))
+    specs = []
+    for i, entry in enumerate(entries):
+        try:
+            time_ms = int(entry["minutes"]) * 60000 if "minutes" in entry else int(entry["ms"])
+            specs.append((str(entry["name"]), time_ms))
+        except (TypeError, KeyError, ValueError):
+            _print(f"[error] {path}: entry {i} needs 'name' and 'minutes' or 'ms'")
+            return 1
+    return cmd_routine_add_batch(addr, specs)
 
 
+@_request_errors
 def cmd_routine_kill(addr: str, iid: str) -> int:
-    return _handle_req(lambda: requests.get(_url(addr, f"/api/task/interval/kill/{iid}"), timeout=TIMEOUT))
+    return _emit(_session().get(_url(addr, f"/api/task/interval/kill/{quote(iid, safe='')}"), timeout=TIMEOUT))
 
 
 # ----- clip -----
 
 def cmd_clip_get(addr: str) -> int:
+    import pyperclip
+    import requests
+
     try:
-        resp = requests.get(_url(addr, "/api/clip"), timeout=TIMEOUT)
+        resp = _session().get(_url(addr, EP_CLIP), timeout=TIMEOUT)
         resp.raise_for_status()
         text = resp.text
         pyperclip.copy(text)
@@ -160,61 +387,77 @@ def cmd_clip_get(addr: str) -> int:
         return 2
 
 
+@_request_errors
 def cmd_clip_save(addr: str, text: str) -> int:
-    return _handle_req(lambda: requests.post(_url(addr, "/api/clip/save"),
-                                             data={"data": text},
-                                             timeout=TIMEOUT))
+    return _emit(_session().post(_url(addr, EP_CLIP_SAVE),
+                                 data={"data": text},
+                                 timeout=TIMEOUT))
 
 
+@_request_errors
 def cmd_clip_history(addr: str) -> int:
-    return _handle_req(lambda: requests.get(_url(addr, "/api/clip/history"), timeout=TIMEOUT))
+    return _emit(_session().get(_url(addr, EP_CLIP_HISTORY), timeout=TIMEOUT))
 
 
+@_request_errors
 def cmd_clip_erase(addr: str) -> int:
-    return _handle_req(lambda: requests.get(_url(addr, "/api/clip/erase"), timeout=TIMEOUT))
+    return _emit(_session().get(_url(addr, EP_CLIP_ERASE), timeout=TIMEOUT))
 
 
 # ----- notes -----
 
+@_request_errors
 def cmd_notes_list(addr: str) -> int:
-    return _handle_req(lambda: requests.get(_url(addr, "/api/notes"), timeout=TIMEOUT))
+    return _emit(_session().get(_url(addr, EP_NOTES_LIST), timeout=TIMEOUT))
 
 
+@_request_errors
 def cmd_notes_add(addr: str, name: str, text: str, date: str) -> int:
-    return _handle_req(lambda: requests.post(_url(addr, "/api/notes/add"),
-                                             data={"name": name, "text": text, "date": date},
-                                             timeout=TIMEOUT))
+    return _emit(_session().post(_url(addr, EP_NOTES_ADD),
+                                 data={"name": name, "text": text, "date": date},
+                                 timeout=TIMEOUT))
 
 
+@_request_errors
 def cmd_notes_del(addr: str, name: str) -> int:
-    return _handle_req(lambda: requests.get(_url(addr, f"/api/notes/del/{name}"), timeout=TIMEOUT))
+    return _emit(_session().get(_url(addr, f"/api/notes/del/{quote(name, safe='')}"), timeout=TIMEOUT))
 
 
 # ----- upload / download -----
 
+@_request_errors
 def cmd_upload_file(addr: str, file_path: str) -> int:
+    from requests_toolbelt import MultipartEncoder
+
     try:
-        with open(file_path, "rb") as f:
-            files = {'file': (os.path.basename(file_path), f)}
-            return _handle_req(lambda: requests.post(_url(addr, "/api/upload"), files=files, timeout=TIMEOUT))
+        f = open(file_path, "rb")
     except OSError as e:
         _print(f"[error] cannot open file: {e}")
         return 3
+    with f:
+        # the encoder reads the file as the body is sent instead of
+        # building the whole multipart payload in memory first
+        body = MultipartEncoder(fields={'file': (os.path.basename(file_path), f, "application/octet-stream")})
+        return _emit(_session().post(_url(addr, EP_UPLOAD), data=body,
+                                     headers={"Content-Type": body.content_type},
+                                     timeout=TIMEOUT))
 
 
+@_request_errors
 def cmd_upload_link(addr: str, url_str: str) -> int:
-    return _handle_req(lambda: requests.post(_url(addr, "/api/uploadLink"),
-                                             data={"link": url_str},
-                                             timeout=TIMEOUT))
+    return _emit(_session().post(_url(addr, EP_UPLOAD_LINK),
+                                 data={"link": url_str},
+                                 timeout=TIMEOUT))
 
 
 def cmd_download(addr: str, server_path: str, output: t.Optional[str]) -> int:
+    import requests
+
     try:
-        resp = requests.get(_url(addr, f"/api/download/{server_path}"), timeout=TIMEOUT)
-        resp.raise_for_status()
-        out = output or os.path.basename(server_path)
-        with open(out, "wb") as f:
-            f.write(resp.content)
+        with _session().get(_url(addr, f"/api/download/{quote(server_path)}"), stream=True, timeout=TIMEOUT) as resp:
+            resp.raise_for_status()
+            out = output or os.path.basename(server_path)
+            _save_stream(resp, out)
         _print(f"downloaded to {out}")
         return 0
     except requests.RequestException as e:
@@ -227,22 +470,28 @@ def cmd_download(addr: str, server_path: str, output: t.Optional[str]) -> int:
 
 # ----- scrapper -----
 
+@_request_errors
 def cmd_scrapper_links(addr: str, link: str, path_param: str) -> int:
     # server expects link without scheme for this endpoint (it will add https://)
     # user may pass example.com or example.com/path
-    return _handle_req(lambda: requests.get(_url(addr, f"/api/scraper/links/?link={link}&path={path_param}"),
-                                           timeout=TIMEOUT))
+    return _emit(_session().get(_url(addr, EP_SCRAPER_LINKS),
+                                params={"link": link, "path": path_param},
+                                timeout=TIMEOUT))
 
 
+@_request_errors
 def cmd_scrapper_imgs(addr: str, link: str, path_param: str) -> int:
-    return _handle_req(lambda: requests.get(_url(addr, f"/api/scraper/imgs/?link={link}&path={path_param}"),
-                                           timeout=TIMEOUT))
+    return _emit(_session().get(_url(addr, EP_SCRAPER_IMGS),
+                                params={"link": link, "path": path_param},
+                                timeout=TIMEOUT))
 
 
+@_request_errors
 def cmd_scrapper_cheerio(addr: str, link: str, parse: str, path_param: str) -> int:
     # multiple selectors separated by spaces are supported by server
-    return _handle_req(lambda: requests.get(_url(addr, f"/api/scraper/cheeriohtml?link={link}&parse={parse}&path={path_param}"),
-                                           timeout=TIMEOUT))
+    return _emit(_session().get(_url(addr, EP_SCRAPER_CHEERIO),
+                                params={"link": link, "parse": parse, "path": path_param},
+                                timeout=TIMEOUT))
 
 
 # ----- proxy -----
@@ -254,70 +503,91 @@ PROXY_PATHS = {
     "httpstxt": "/api/txt/httpps/",
 }
 
+# proxy type -> fetcher with its route prefix bound once, so proxying many
+# targets does one lookup and no per-call prefix concatenation
+PROXY_FETCHERS: t.Dict[str, t.Callable[[str, str], requests.Response]] = {
+    ptype: (lambda addr, target, prefix=prefix:
+            _session().get(_url(addr, prefix) + quote(target, safe="/:"), timeout=TIMEOUT))
+    for ptype, prefix in PROXY_PATHS.items()
+}
+
 
+@_request_errors
 def cmd_proxy(addr: str, ptype: str, target: str) -> int:
-    prefix = PROXY_PATHS[ptype]
     # target should be host/path without scheme; this mirrors the server routing
-    return _handle_req(lambda: requests.get(_url(addr, prefix + target), timeout=TIMEOUT))
+    return _emit(PROXY_FETCHERS[ptype](addr, target))
 
 
 # ----- files -----
 
+@_request_errors
 def cmd_files_list(addr: str) -> int:
-    return _handle_req(lambda: requests.get(_url(addr, "/api/files/list"), timeout=TIMEOUT))
+    return _emit(_session().get(_url(addr, EP_FILES_LIST), timeout=TIMEOUT))
 
 
+@_request_errors
 def cmd_files_del(addr: str, path_param: str) -> int:
-    return _handle_req(lambda: requests.get(_url(addr, f"/api/files/del?path={path_param}"), timeout=TIMEOUT))
+    return _emit(_session().get(_url(addr, EP_FILES_DEL), params={"path": path_param}, timeout=TIMEOUT))
 
 
+@_request_errors
 def cmd_files_mv(addr: str, old: str, new: str) -> int:
-    return _handle_req(lambda: requests.get(_url(addr, f"/api/files/mv?old={old}&new={new}"), timeout=TIMEOUT))
+    return _emit(_session().get(_url(addr, EP_FILES_MV), params={"old": old, "new": new}, timeout=TIMEOUT))
 
 
+@_request_errors
 def cmd_files_write(addr: str, save_path: str, name: str, data: str) -> int:
-    return _handle_req(lambda: requests.post(_url(addr, "/api/write/"),
-                                             data={"path": save_path, "name": name, "data": data},
-                                             timeout=TIMEOUT))
+    return _emit(_session().post(_url(addr, EP_FILES_WRITE),
+                                 data={"path": save_path, "name": name, "data": data},
+                                 timeout=TIMEOUT))
 
 
 # ----- config -----
 
+@_request_errors
 def cmd_config_import(addr: str, path_param: str) -> int:
-    return _handle_req(lambda: requests.get(_url(addr, f"/api/cfg/import?path={path_param}"), timeout=TIMEOUT))
+    _forget_task_names(addr)
+    return _emit(_session().get(_url(addr, EP_CFG_IMPORT), params={"path": path_param}, timeout=TIMEOUT))
 
 
+@_request_errors
 def cmd_config_export(addr: str, name: str) -> int:
-    return _handle_req(lambda: requests.get(_url(addr, f"/api/cfg/export?name={name}"), timeout=TIMEOUT))
+    return _emit(_session().get(_url(addr, EP_CFG_EXPORT), params={"name": name}, timeout=TIMEOUT))
 
 
 # ----- restart / health / console -----
 
+@_request_errors
 def cmd_restart(addr: str, force: bool) -> int:
     if not force:
+        if sys.stdin is None or not sys.stdin.isatty():
+            # piped or closed stdin would hang or read a bogus answer
+            _print("[error] refusing to prompt without TTY; use --force")
+            return 1
         ans = input("Are you sure? YES/NO ").strip()
         if ans != "YES":
             _print("aborted")
             return 0
-    return _handle_req(lambda: requests.get(_url(addr, "/api/restart"), timeout=TIMEOUT))
+    _forget_task_names(addr)
+    return _emit(_session().get(_url(addr, EP_RESTART), timeout=TIMEOUT))
 
 
+@_request_errors
 def cmd_health(addr: str) -> int:
-    return _handle_req(lambda: requests.get(_url(addr, "/health"), timeout=TIMEOUT))
+    return _emit(_session().get(_url(addr, EP_HEALTH), timeout=TIMEOUT))
 
 
+@_request_errors
 def cmd_console(addr: str, text: str) -> int:
     # GET variant, mirrors server
-    return _handle_req(lambda: requests.get(_url(addr, f"/api/console?text={requests.utils.quote(text)}"), timeout=TIMEOUT))
+    return _emit(_session().get(_url(addr, EP_CONSOLE), params={"text": text}, timeout=TIMEOUT))
 
 
-def build_parser() -> argparse.ArgumentParser:
-    p = argparse.ArgumentParser(description="Home Middleman CLI", formatter_class=argparse.ArgumentDefaultsHelpFormatter)
-    p.add_argument("--addr", default=DEFAULT_ADDR, help="Server address, e.g. http://localhost:1337")
-    sp = p.add_subparsers(dest="cmd", required=True)
+# ----- argument parsing -----
+# Only the subcommand being invoked gets its arguments registered; building
+# every nested subparser up front dominated startup time for a one-shot CLI.
 
-    # tasks
-    tasks = sp.add_parser("tasks", help="Manage tasks")
+def _build_tasks(tasks: argparse.ArgumentParser) -> None:
     tsp = tasks.add_subparsers(dest="op", required=True)
 
     tsp.add_parser("list", help="List tasks")
@@ -346,8 +616,8 @@ def build_parser() -> argparse.ArgumentParser:
     tlog = tsp.add_parser("log", help="Save task logs to file")
     tlog.add_argument("-o", "--out", default="tasks.json", help="Output file")
 
-    # routine
-    routine = sp.add_parser("routine", help="Routine (interval) operations")
+
+def _build_routine(routine: argparse.ArgumentParser) -> None:
     rsp = routine.add_subparsers(dest="op", required=True)
     rsp.add_parser("list", help="List routine tasks")
     radd = rsp.add_parser("add", help="Add task to routine")
@@ -355,11 +625,14 @@ def build_parser() -> argparse.ArgumentParser:
     tm = radd.add_mutually_exclusive_group(required=True)
     tm.add_argument("--minutes", type=int, help="Interval in minutes")
     tm.add_argument("--ms", type=int, help="Interval in milliseconds")
+    rmany = rsp.add_parser("add-many", help="Add several routines, validating tasks once")
+    rmany.add_argument("--file", help="JSON list of {\"name\", \"minutes\" or \"ms\"}; "
+                                      "without it, 'NAME MINUTES' lines are read from stdin")
     rkill = rsp.add_parser("kill", help="Kill routine by interval id")
     rkill.add_argument("--id", required=True, dest="iid")
 
-    # clip
-    clip = sp.add_parser("clip", help="Clipboard operations")
+
+def _build_clip(clip: argparse.ArgumentParser) -> None:
     csp = clip.add_subparsers(dest="op", required=True)
     csp.add_parser("get", help="Copy latest server clip to local clipboard and print")
     csave = csp.add_parser("save", help="Save text to server clipboard")
@@ -367,8 +640,8 @@ def build_parser() -> argparse.ArgumentParser:
     csp.add_parser("history", help="Show clipboard history")
     csp.add_parser("erase", help="Erase clipboard history")
 
-    # notes
-    notes = sp.add_parser("notes", help="Notes operations")
+
+def _build_notes(notes: argparse.ArgumentParser) -> None:
     nsp = notes.add_subparsers(dest="op", required=True)
     nsp.add_parser("list", help="List notes")
     nadd = nsp.add_parser("add", help="Add a note")
@@ -378,21 +651,21 @@ def build_parser() -> argparse.ArgumentParser:
     ndel = nsp.add_parser("del", help="Delete a note")
     ndel.add_argument("--name", required=True)
 
-    # upload
-    upload = sp.add_parser("upload", help="Upload files or by link")
+
+def _build_upload(upload: argparse.ArgumentParser) -> None:
     usp = upload.add_subparsers(dest="op", required=True)
     ufile = usp.add_parser("file", help="Upload a local file")
     ufile.add_argument("--path", required=True, help="Local file path")
     ulink = usp.add_parser("link", help="Upload by URL")
     ulink.add_argument("--url", required=True, help="Remote file URL (http/https)")
 
-    # download
-    dl = sp.add_parser("download", help="Download a file from server upload/")
+
+def _build_download(dl: argparse.ArgumentParser) -> None:
     dl.add_argument("--server-path", required=True, help="Path under upload/")
     dl.add_argument("-o", "--out", help="Local output path")
 
-    # scrapper
-    scr = sp.add_parser("scrapper", help="Scrape web data")
+
+def _build_scrapper(scr: argparse.ArgumentParser) -> None:
     ssp = scr.add_subparsers(dest="op", required=True)
     slinks = ssp.add_parser("links", help="Scrape links into JSON (server saves file)")
     slinks.add_argument("--link", required=True, help="example.com[/path]")
@@ -405,13 +678,13 @@ def build_parser() -> argparse.ArgumentParser:
     scheerio.add_argument("--parse", required=True, help="Selectors separated by spaces, e.g. \"h3 p a title\"")
     scheerio.add_argument("--path", required=True)
 
-    # proxy
-    proxy = sp.add_parser("proxy", help="Proxy a request via server")
+
+def _build_proxy(proxy: argparse.ArgumentParser) -> None:
     proxy.add_argument("ptype", choices=list(PROXY_PATHS.keys()), help="Proxy type")
     proxy.add_argument("--target", required=True, help="host/path (no scheme) to fetch")
 
-    # files
-    files = sp.add_parser("files", help="File operations on upload/")
+
+def _build_files(files: argparse.ArgumentParser) -> None:
     fsp = files.add_subparsers(dest="op", required=True)
     fsp.add_parser("list", help="List files")
     fdel = fsp.add_parser("del", help="Delete a file")
@@ -424,120 +697,165 @@ def build_parser() -> argparse.ArgumentParser:
     fwr.add_argument("--name", required=True, help="File name")
     fwr.add_argument("--data", required=True, help="File content")
 
-    # config
-    cfg = sp.add_parser("config", help="Import/export configuration")
+
+def _build_config(cfg: argparse.ArgumentParser) -> None:
     cgsp = cfg.add_subparsers(dest="op", required=True)
     cimp = cgsp.add_parser("import", help="Import configuration from upload/")
     cimp.add_argument("--path", required=True, help="Path in upload/ to JSON")
     cexp = cgsp.add_parser("export", help="Export configuration to upload/")
     cexp.add_argument("--name", required=True, help="Base name for JSON (no extension)")
 
-    # restart, health, console
-    rst = sp.add_parser("restart", help="Restart Home Middleman state")
+
+def _build_restart(rst: argparse.ArgumentParser) -> None:
     rst.add_argument("--force", action="store_true", help="Skip confirmation prompt")
 
-    sp.add_parser("health", help="Server health")
 
-    con = sp.add_parser("console", help="Print text in server console")
+def _build_console(con: argparse.ArgumentParser) -> None:
     con.add_argument("--text", required=True)
 
+
+# top-level command -> (help, builder that registers its arguments)
+COMMANDS: t.Dict[str, t.Tuple[str, t.Optional[t.Callable[[argparse.ArgumentParser], None]]]] = {
+    "tasks": ("Manage tasks", _build_tasks),
+    "routine": ("Routine (interval) operations", _build_routine),
+    "clip": ("Clipboard operations", _build_clip),
+    "notes": ("Notes operations", _build_notes),
+    "upload": ("Upload files or by link", _build_upload),
+    "download": ("Download a file from server upload/", _build_download),
+    "scrapper": ("Scrape web data", _build_scrapper),
+    "proxy": ("Proxy a request via server", _build_proxy),
+    "files": ("File operations on upload/", _build_files),
+    "config": ("Import/export configuration", _build_config),
+    "restart": ("Restart Home Middleman state", _build_restart),
+    "health": ("Server health", None),
+    "console": ("Print text in server console", _build_console),
+}
+
+
+@functools.lru_cache(maxsize=1)
+def _peek_parser() -> argparse.ArgumentParser:
+    pre = argparse.ArgumentParser(add_help=False)
+    pre.add_argument("--addr", nargs="?")  # a missing value is reported by the real parser
+    pre.add_argument("cmd", nargs="?")
+    return pre
+
+
+def _peek_cmd(argv: t.List[str]) -> t.Optional[str]:
+    # cheap first pass: find which top-level command was asked for
+    known, _ = _peek_parser().parse_known_args(argv)
+    return known.cmd
+
+
+# parsers depend only on the command name, so repeated main() calls in one
+# process (scripts, tests, REPL) reuse them and only pay for parse_args;
+# at most one entry per command plus None
+@functools.lru_cache(maxsize=len(COMMANDS) + 1)
+def build_parser(cmd: t.Optional[str] = None) -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(description="Home Middleman CLI", formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    p.add_argument("--addr", default=DEFAULT_ADDR, help="Server address, e.g. http://localhost:1337")
+    sp = p.add_subparsers(dest="cmd", required=True)
+
+    for name, (help_text, builder) in COMMANDS.items():
+        sub = sp.add_parser(name, help=help_text)
+        if name == cmd and builder is not None:
+            builder(sub)
+
     return p
 
 
+# (cmd, op, mode) -> handler; op/mode are None for commands without them
+DISPATCH: t.Dict[t.Tuple[str, t.Optional[str], t.Optional[str]], t.Callable[[argparse.Namespace], int]] = {
+    ("tasks", "list", None): lambda a: cmd_tasks_list(a.addr),
+    ("tasks", "add", "get"): lambda a: cmd_tasks_add_get(a.addr, a.name, a.type, a.data),
+    ("tasks", "add", "post"): lambda a: cmd_tasks_add_post(a.addr, a.name, a.type, a.data, a.post_type, a.post_data),
+    ("tasks", "run", None): lambda a: cmd_tasks_run(a.addr, a.name),
+    ("tasks", "del", None): lambda a: cmd_tasks_del(a.addr, a.name),
+    ("tasks", "log", None): lambda a: cmd_tasks_log(a.addr, a.out),
+    ("routine", "list", None): lambda a: cmd_routine_list(a.addr),
+    ("routine", "add", None): lambda a: cmd_routine_add(a.addr, a.name, a.minutes, a.ms),
+    ("routine", "add-many", None): lambda a: (cmd_routine_add_file(a.addr, a.file) if a.file
+                                              else cmd_routine_add_many(a.addr, sys.stdin)),
+    ("routine", "kill", None): lambda a: cmd_routine_kill(a.addr, a.iid),
+    ("clip", "get", None): lambda a: cmd_clip_get(a.addr),
+    ("clip", "save", None): lambda a: cmd_clip_save(a.addr, a.text),
+    ("clip", "history", None): lambda a: cmd_clip_history(a.addr),
+    ("clip", "erase", None): lambda a: cmd_clip_erase(a.addr),
+    ("notes", "list", None): lambda a: cmd_notes_list(a.addr),
+    ("notes", "add", None): lambda a: cmd_notes_add(a.addr, a.name, a.text, a.date),
+    ("notes", "del", None): lambda a: cmd_notes_del(a.addr, a.name),
+    ("upload", "file", None): lambda a: cmd_upload_file(a.addr, a.path),
+    ("upload", "link", None): lambda a: cmd_upload_link(a.addr, a.url),
+    ("download", None, None): lambda a: cmd_download(a.addr, a.server_path, a.out),
+    ("scrapper", "links", None): lambda a: cmd_scrapper_links(a.addr, a.link, a.path),
+    ("scrapper", "imgs", None): lambda a: cmd_scrapper_imgs(a.addr, a.link, a.path),
+    ("scrapper", "cheerio", None): lambda a: cmd_scrapper_cheerio(a.addr, a.link, a.parse, a.path),
+    ("proxy", None, None): lambda a: cmd_proxy(a.addr, a.ptype, a.target),
+    ("files", "list", None): lambda a: cmd_files_list(a.addr),
+    ("files", "del", None): lambda a: cmd_files_del(a.addr, a.path),
+    ("files", "mv", None): lambda a: cmd_files_mv(a.addr, a.old, a.new),
+    ("files", "write", None): lambda a: cmd_files_write(a.addr, a.path, a.name, a.data),
+    ("config", "import", None): lambda a: cmd_config_import(a.addr, a.path),
+    ("config", "export", None): lambda a: cmd_config_export(a.addr, a.name),
+    ("restart", None, None): lambda a: cmd_restart(a.addr, a.force),
+    ("health", None, None): lambda a: cmd_health(a.addr),
+    ("console", None, None): lambda a: cmd_console(a.addr, a.text),
+}
+
+
+def _short_usage() -> str:
+    prog = os.path.basename(sys.argv[0]) or "hmmClient.py"
+    width = max(len(name) for name in COMMANDS) + 2
+    lines = [f"usage: {prog} [-h] [--addr ADDR] <command> ...", "",
+             "Home Middleman CLI", "",
+             "commands:"]
+    lines += [f"  {name:<{width}}{help_text}" for name, (help_text, _) in COMMANDS.items()]
+    lines += ["", "options:",
+              "  -h, --help   show this help message and exit",
+              f"  --addr ADDR  Server address (default: {DEFAULT_ADDR})", "",
+              f"Run '{prog} <command> -h' for the options of a command."]
+    return "\n".join(lines)
+
+
+def _fast_path(argv: t.List[str]) -> t.Optional[int]:
+    # invocations simple enough to handle without building any parser
+    if not argv:
+        # a usage error, like argparse's: keep it off stdout
+        print(_short_usage(), file=sys.stderr)
+        return 2
+    if argv in (["-h"], ["--help"]):
+        _print(_short_usage())
+        return 0
+
+    addr, rest = DEFAULT_ADDR, argv
+    if len(argv) >= 2 and argv[0] == "--addr":
+        addr, rest = argv[1], argv[2:]
+    elif argv[0].startswith("--addr="):
+        addr, rest = argv[0].split("=", 1)[1], argv[1:]
+
+    if rest == ["health"]:
+        return cmd_health(addr.rstrip("/"))
+    if rest == ["restart", "--force"]:
+        return cmd_restart(addr.rstrip("/"), True)
+    return None
+
+
 def main(argv: t.List[str]) -> int:
-    parser = build_parser()
+    rc = _fast_path(argv)
+    if rc is not None:
+        return rc
+
+    cmd = _peek_cmd(argv)
+    # unknown names build the same parser as None, keeping the cache bounded
+    parser = build_parser(cmd if cmd in COMMANDS else None)
     args = parser.parse_args(argv)
 
-    addr = args.addr
-
-    if args.cmd == "tasks":
-        if args.op == "list":
-            return cmd_tasks_list(addr)
-        if args.op == "add":
-            if args.mode == "get":
-                return cmd_tasks_add_get(addr, args.name, args.type, args.data)
-            if args.mode == "post":
-                return cmd_tasks_add_post(addr, args.name, args.type, args.data, args.post_type, args.post_data)
-        if args.op == "run":
-            return cmd_tasks_run(addr, args.name)
-        if args.op == "del":
-            return cmd_tasks_del(addr, args.name)
-        if args.op == "log":
-            return cmd_tasks_log(addr, args.out)
-
-    elif args.cmd == "routine":
-        if args.op == "list":
-            return cmd_routine_list(addr)
-        if args.op == "add":
-            return cmd_routine_add(addr, args.name, getattr(args, "minutes", None), getattr(args, "ms", None))
-        if args.op == "kill":
-            return cmd_routine_kill(addr, args.iid)
-
-    elif args.cmd == "clip":
-        if args.op == "get":
-            return cmd_clip_get(addr)
-        if args.op == "save":
-            return cmd_clip_save(addr, args.text)
-        if args.op == "history":
-            return cmd_clip_history(addr)
-        if args.op == "erase":
-            return cmd_clip_erase(addr)
-
-    elif args.cmd == "notes":
-        if args.op == "list":
-            return cmd_notes_list(addr)
-        if args.op == "add":
-            return cmd_notes_add(addr, args.name, args.text, args.date)
-        if args.op == "del":
-            return cmd_notes_del(addr, args.name)
-
-    elif args.cmd == "upload":
-        if args.op == "file":
-            return cmd_upload_file(addr, args.path)
-        if args.op == "link":
-            return cmd_upload_link(addr, args.url)
-
-    elif args.cmd == "download":
-        return cmd_download(addr, args.server_path, args.out)
-
-    elif args.cmd == "scrapper":
-        if args.op == "links":
-            return cmd_scrapper_links(addr, args.link, args.path)
-        if args.op == "imgs":
-            return cmd_scrapper_imgs(addr, args.link, args.path)
-        if args.op == "cheerio":
-            return cmd_scrapper_cheerio(addr, args.link, args.parse, args.path)
-
-    elif args.cmd == "proxy":
-        return cmd_proxy(addr, args.ptype, args.target)
-
-    elif args.cmd == "files":
-        if args.op == "list":
-            return cmd_files_list(addr)
-        if args.op == "del":
-            return cmd_files_del(addr, args.path)
-        if args.op == "mv":
-            return cmd_files_mv(addr, args.old, args.new)
-        if args.op == "write":
-            return cmd_files_write(addr, args.path, args.name, args.data)
-
-    elif args.cmd == "config":
-        if args.op == "import":
-            return cmd_config_import(addr, args.path)
-        if args.op == "export":
-            return cmd_config_export(addr, args.name)
-
-    elif args.cmd == "restart":
-        return cmd_restart(addr, args.force)
-
-    elif args.cmd == "health":
-        return cmd_health(addr)
-
-    elif args.cmd == "console":
-        return cmd_console(addr, args.text)
-
-    parser.print_help()
-    return 1
+    args.addr = args.addr.rstrip("/")
+
+    handler = DISPATCH.get((args.cmd, getattr(args, "op", None), getattr(args, "mode", None)))
+    if handler is None:
+        parser.print_help()
+        return 1
+    return handler(args)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Home Middleman async client for scripted bulk operations
+
+hmmClient.py sends one request at a time. This module overlaps many
+independent requests (proxy fetches, scrapes, task runs, ...) over a shared
+connection pool. Requires httpx: pip install "httpx[http2]"
+
+Example:
+  import asyncio
+  import hmm_async as hmm
+
+  responses = asyncio.run(hmm.run_many("http://localhost:1337", [
+      hmm.proxy("http", "example.com"),
+      hmm.proxy("https", "example.org/about"),
+      hmm.scrape_links("example.com", "scraped/"),
+      hmm.task_run("ping"),
+      hmm.files_list(),
+  ]))
+  for r in responses:
+      print(r if isinstance(r, Exception) else r.text)
+"""
+
+import asyncio
+import importlib.util
+import typing as t
+from urllib.parse import quote
+
+import httpx
+
+from hmmClient import (
+    EP_FILES_LIST,
+    EP_SCRAPER_CHEERIO,
+    EP_SCRAPER_IMGS,
+    EP_SCRAPER_LINKS,
+    EP_TASK_RUN,
+    PROXY_PATHS,
+    TIMEOUT,
+    _url,
+)
+
+MAX_CONNECTIONS = 20  # requests in flight at once
+# HTTP/2 is negotiated over TLS only and needs the optional h2 package
+HTTP2 = importlib.util.find_spec("h2") is not None
+
+
+class Op(t.NamedTuple):
+    method: str
+    path: str
+    params: t.Optional[t.Dict[str, str]] = None
+    data: t.Optional[t.Dict[str, str]] = None
+
+
+# ----- op builders -----
+
+def get(path: str, /, **params: str) -> Op:
+    return Op("GET", path, params or None)
+
+
+def post(path: str, /, **data: str) -> Op:
+    return Op("POST", path, data=data)
+
+
+def task_run(name: str) -> Op:
+    return post(EP_TASK_RUN, name=name)
+
+
+def proxy(ptype: str, target: str) -> Op:
+    return get(PROXY_PATHS[ptype] + quote(target, safe="/:"))
+
+
+def scrape_links(link: str, path_param: str) -> Op:
+    return get(EP_SCRAPER_LINKS, link=link, path=path_param)
+
+
+def scrape_imgs(link: str, path_param: str) -> Op:
+    return get(EP_SCRAPER_IMGS, link=link, path=path_param)
+
+
+def scrape_cheerio(link: str, parse: str, path_param: str) -> Op:
+    return get(EP_SCRAPER_CHEERIO, link=link, parse=parse, path=path_param)
+
+
+def files_list() -> Op:
+    return get(EP_FILES_LIST)
+
+
+# ----- runner -----
+
+async def run_many(addr: str, ops: t.Iterable[Op]) -> t.List[t.Union[httpx.Response, Exception]]:
+    # results come back in the order of ops; a failed request yields its
+    # exception instead of cancelling the rest
+    addr = addr.rstrip("/")
+    limits = httpx.Limits(max_connections=MAX_CONNECTIONS)
+    # the semaphore keeps queued requests from timing out while they wait
+    # for a free pooled connection
+    slots = asyncio.Semaphore(MAX_CONNECTIONS)
+
+    async with httpx.AsyncClient(http2=HTTP2, limits=limits, timeout=TIMEOUT) as client:
+        async def send(op: Op) -> httpx.Response:
+            async with slots:
+                return await client.request(op.method, _url(addr, op.path), params=op.params, data=op.data)
+
+        return await asyncio.gather(*(send(op) for op in ops), return_exceptions=True)